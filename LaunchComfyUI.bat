@@ -9,6 +9,7 @@ set "VENV_DIR="
 set "AUTO_ARGS=--auto-launch"
 set "UPDATE_CHECK=1"
 set "ICON_PATH="
+set "DISABLED_NODES="
 
 if exist "%CFG_FILE%" (
   for /f "usebackq eol=# tokens=1,* delims==" %%A in ("%CFG_FILE%") do (
@@ -19,6 +20,7 @@ if exist "%CFG_FILE%" (
     if /i "!key!"=="AUTO_ARGS" set "AUTO_ARGS=!val!"
     if /i "!key!"=="UPDATE_CHECK" set "UPDATE_CHECK=!val!"
     if /i "!key!"=="ICON_PATH" set "ICON_PATH=!val!"
+    if /i "!key!"=="DISABLED_NODES" set "DISABLED_NODES=!val!"
   )
 )
 
@@ -75,6 +77,28 @@ if errorlevel 1 (
 )
 echo [INFO] 启动参数: %AUTO_ARGS%
 
+rem 按 DISABLED_NODES 构造白名单参数跳过节点，不改动 custom_nodes 目录
+set "NODE_ARGS="
+if defined DISABLED_NODES (
+  set "DISABLED_NODES=!DISABLED_NODES:, =,!"
+  echo [INFO] 禁用自定义节点: !DISABLED_NODES!
+  set "KEEP="
+  for /f "delims=" %%N in ('dir /b "%COMFYUI_DIR%\custom_nodes" 2^>nul') do (
+    set "name=%%N"
+    set "skip="
+    if "!name:~0,1!"=="." set "skip=1"
+    if "!name:~0,2!"=="__" set "skip=1"
+    if /i "!name:~-9!"==".disabled" set "skip=1"
+    if not exist "%COMFYUI_DIR%\custom_nodes\%%N\" if /i not "%%~xN"==".py" set "skip=1"
+    for %%D in ("!DISABLED_NODES:,=" "!") do (
+      if /i "%%~D"=="%%N" set "skip=1"
+    )
+    if not defined skip set "KEEP=!KEEP! "%%N""
+  )
+  set "NODE_ARGS=--disable-all-custom-nodes"
+  if defined KEEP set "NODE_ARGS=!NODE_ARGS! --whitelist-custom-nodes!KEEP!"
+)
+
 if /i "%UPDATE_CHECK%"=="1" (
   pushd "%COMFYUI_DIR%"
   git rev-parse --is-inside-work-tree >nul 2>&1
@@ -96,7 +120,7 @@ if /i "%UPDATE_CHECK%"=="1" (
 )
 
 pushd "%COMFYUI_DIR%"
-"%PYTHON_EXE%" "main.py" %AUTO_ARGS%
+"%PYTHON_EXE%" "main.py" %AUTO_ARGS% %NODE_ARGS%
 set "EXITCODE=%ERRORLEVEL%"
 popd
 
@@ -0,0 +1,132 @@
+import argparse
+import random
+import sys
+import time
+
+# 代替 ComfyUI main.py 的日志洪峰生成器，供 bench/harness.py 使用。
+# 每条以换行结束的输出行末尾带有 " #ts=<纳秒时间戳>"，用于计算端到端延迟。
+
+LOG_LINES = [
+    "got prompt",
+    "model weight dtype torch.float16, manual cast: None",
+    "Requested to load SDXLClipModel",
+    "loaded completely 9865.8 1560.802734375 True",
+    "Prompt executed in 3.27 seconds",
+    "[INFO] Using pytorch attention in VAE",
+    "[WARN] clip missing: ['clip_l.logit_scale']",
+    "[WARNING] torch.cuda.amp.autocast(args...) is deprecated",
+    "[ERROR] Failed to validate prompt for output 9",
+]
+
+TRACEBACK_LINES = [
+    "Traceback (most recent call last):",
+    '  File "C:\\ComfyUI\\nodes.py", line 2106, in load_custom_node',
+    "    module_spec.loader.exec_module(module)",
+    '  File "<frozen importlib._bootstrap_external>", line 940, in exec_module',
+    '  File "C:\\ComfyUI\\custom_nodes\\ComfyUI-Broken\\__init__.py", line 3, in <module>',
+    "    import missing_dependency",
+    "ModuleNotFoundError: No module named 'missing_dependency'",
+]
+
+
+def parse_mix(value: str):
+    mix = {}
+    for part in value.split(","):
+        if "=" in part:
+            k, v = part.split("=", 1)
+            mix[k.strip()] = float(v)
+    return mix
+
+
+class Emitter:
+    def __init__(self):
+        self.emitted = 0
+
+    def line(self, stream, text: str):
+        stream.write(f"{text} #ts={time.time_ns()}\n")
+        stream.flush()
+        self.emitted += 1
+
+    def log(self, rnd):
+        self.line(sys.stdout, rnd.choice(LOG_LINES))
+
+    def tqdm(self, rnd, frames: int):
+        # 模拟 tqdm：在 stderr 上用 \r 反复重绘同一行，最后才换行
+        total = frames
+        for i in range(1, total + 1):
+            pct = i * 100 // total
+            bar = "#" * (pct // 10) + " " * (10 - pct // 10)
+            frame = f"\r{pct:3d}%|{bar}| {i}/{total} [00:00<00:00, {rnd.uniform(5, 15):.2f}it/s]"
+            if i < total:
+                sys.stderr.write(frame)
+                sys.stderr.flush()
+            else:
+                self.line(sys.stderr, frame)
+
+    def traceback(self):
+        for text in TRACEBACK_LINES:
+            self.line(sys.stderr, text)
+
+    def burst(self, rnd, size: int):
+        for _ in range(size):
+            self.log(rnd)
+
+    def startup(self):
+        # 与 ComfyUI 启动输出一致的节点导入耗时表，覆盖启动器的解析逻辑
+        print("Import times for custom nodes:")
+        print("   0.0 seconds: C:\\ComfyUI\\custom_nodes\\websocket_image_save.py")
+        print("   0.4 seconds: C:\\ComfyUI\\custom_nodes\\ComfyUI-Manager")
+        print("")
+        print("Starting server\n")
+        print("To see the GUI go to: http://127.0.0.1:8188")
+        sys.stdout.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ComfyUI 日志洪峰模拟器")
+    parser.add_argument("--rate", type=float, default=200.0, help="每秒事件数，0 表示不限速")
+    parser.add_argument("--duration", type=float, default=5.0, help="持续秒数")
+    parser.add_argument("--mix", default="log=100", help="事件权重，如 log=70,tqdm=20,traceback=5,burst=5")
+    parser.add_argument("--burst-size", type=int, default=500, help="每次 burst 的行数")
+    parser.add_argument("--tqdm-frames", type=int, default=50, help="每个进度条的重绘次数")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-startup", action="store_true", help="不输出启动信息")
+    # 启动器会追加 --auto-launch 等参数，这里忽略未知参数
+    args, _unknown = parser.parse_known_args()
+
+    rnd = random.Random(args.seed)
+    mix = parse_mix(args.mix)
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    em = Emitter()
+
+    if not args.no_startup:
+        em.startup()
+
+    start = time.perf_counter()
+    n = 0
+    while True:
+        now = time.perf_counter()
+        if now - start >= args.duration:
+            break
+        if args.rate > 0:
+            due = start + n / args.rate
+            if due > now:
+                time.sleep(due - now)
+        kind = rnd.choices(kinds, weights)[0]
+        if kind == "log":
+            em.log(rnd)
+        elif kind == "tqdm":
+            em.tqdm(rnd, args.tqdm_frames)
+        elif kind == "traceback":
+            em.traceback()
+        elif kind == "burst":
+            em.burst(rnd, args.burst_size)
+        n += 1
+
+    sys.stderr.flush()
+    em.line(sys.stdout, f"[INFO] [bench] done emitted={em.emitted + 1}")
+
+
+if __name__ == "__main__":
+    main()
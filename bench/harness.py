@@ -0,0 +1,505 @@
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# 启动器日志管线基准：用 bench/fake_main.py 代替 ComfyUI，
+# 测量 LauncherApp（gui）与 launch_comfyui.py（cli）在日志洪峰下的表现。
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+FAKE_MAIN = os.path.join(BENCH_DIR, "fake_main.py")
+RESULTS_PATH = os.path.join(BENCH_DIR, "results.jsonl")
+RE_TS = re.compile(r" #ts=(\d+)$")
+RE_DONE = re.compile(r"\[bench\] done emitted=(\d+)")
+
+SCENARIOS = {
+    "steady": {"rate": 500, "mix": "log=100"},
+    "tqdm": {"rate": 50, "mix": "log=20,tqdm=80"},
+    "traceback": {"rate": 200, "mix": "log=60,traceback=40"},
+    "burst": {"rate": 20, "mix": "log=50,burst=50", "burst_size": 2000},
+    "mixed": {"rate": 300, "mix": "log=70,tqdm=15,traceback=10,burst=5", "burst_size": 500},
+    # 不限速：输出速度只受启动器读取速度限制，用于测量真实吞吐上限
+    "flood": {"rate": 0, "mix": "log=80,traceback=10,tqdm=10"},
+}
+
+# 与历史基线（最近几次同条件结果的中位数）相比的回归阈值：(指标, 方向, 允许的相对变化)
+REGRESSION_RULES = [
+    ("throughput_lps", "lower", 0.20),
+    ("latency_p50_ms", "higher", 0.25),
+    ("latency_p95_ms", "higher", 0.25),
+    ("stall_max_ms", "higher", 0.50),
+    ("stall_total_ms", "higher", 0.50),
+    ("rebuild_ms", "higher", 0.25),
+    ("peak_rss_kb", "higher", 0.20),
+    ("passthrough_lps", "lower", 0.20),
+    ("passthrough_latency_p95_ms", "higher", 0.25),
+    ("launcher_rss_kb", "higher", 0.20),
+]
+BASELINE_WINDOW = 5
+
+# CLI 模式下 launch_comfyui.py 直接继承管道、不处理日志，指标只反映管道直通的基线
+CLI_METRIC_NAMES = {
+    "throughput_lps": "passthrough_lps",
+    "latency_p50_ms": "passthrough_latency_p50_ms",
+    "latency_p95_ms": "passthrough_latency_p95_ms",
+    "latency_p99_ms": "passthrough_latency_p99_ms",
+    "latency_max_ms": "passthrough_latency_max_ms",
+}
+
+# 毫秒指标的绝对变化低于该值时视为噪声
+MIN_MS_DELTA = 1.0
+HEARTBEAT_MS = 10
+POLL_MS = 20
+STALL_THRESHOLD_MS = 50
+
+
+def fake_args(scenario: dict, duration: float):
+    args = ["--rate", str(scenario["rate"]), "--duration", str(duration), "--mix", scenario["mix"]]
+    if "burst_size" in scenario:
+        args += ["--burst-size", str(scenario["burst_size"])]
+    return args
+
+
+def make_comfy_dir():
+    comfy_dir = tempfile.mkdtemp(prefix="comfy_bench_")
+    shutil.copy(FAKE_MAIN, os.path.join(comfy_dir, "main.py"))
+    os.makedirs(os.path.join(comfy_dir, "custom_nodes"), exist_ok=True)
+    return comfy_dir
+
+
+def percentile(values: list, pct: float):
+    if not values:
+        return None
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))
+    return round(values[idx], 3)
+
+
+def peak_rss_kb():
+    # 优先使用标准库 resource（POSIX），否则尝试可选的 psutil
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss // 1024 if sys.platform == "darwin" else rss
+    except Exception:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) // 1024
+    except Exception:
+        return None
+
+
+def process_peak_rss_kb(pid: int):
+    # 单个进程（不含其子进程）的峰值内存：Linux 读 /proc 的 VmHWM，其余平台用可选的 psutil
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except Exception:
+        pass
+    try:
+        import psutil
+        info = psutil.Process(pid).memory_info()
+        return getattr(info, "peak_wset", info.rss) // 1024
+    except Exception:
+        return None
+
+
+class PeakSampler:
+    """在后台定期采样指定进程的峰值内存，进程退出后保留最大值。"""
+
+    def __init__(self, pid: int, interval: float = 0.05):
+        self.pid = pid
+        self.interval = interval
+        self.peak = None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self.stopped.is_set():
+            value = process_peak_rss_kb(self.pid)
+            if value is not None:
+                self.peak = max(self.peak or 0, value)
+            self.stopped.wait(self.interval)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        return self.peak
+
+
+class LineStats:
+    """统计带时间戳的输出行：接收数量、首末时间、读取延迟与显示延迟。"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.received = 0
+        self.emitted = None
+        self.first = None
+        self.last = None
+        self.ingest = []
+        self.latencies = []
+        self.pending = []
+        self.probe_scheduled = False
+
+    def record(self, text: str, displayed: bool = True):
+        # displayed=False 时只记录读取延迟，显示时间由 mark_displayed 补记
+        now = time.time_ns()
+        m = RE_TS.search(text)
+        if not m:
+            return None
+        ts = int(m.group(1))
+        with self.lock:
+            self.received += 1
+            self.ingest.append((now - ts) / 1e6)
+            if displayed:
+                self.latencies.append((now - ts) / 1e6)
+            if self.first is None:
+                self.first = now
+            self.last = now
+            done = RE_DONE.search(text)
+            if done:
+                self.emitted = int(done.group(1))
+        return ts
+
+    def queue_display(self, ts: int):
+        # 返回 True 表示需要安排一次 UI 线程探针
+        with self.lock:
+            self.pending.append(ts)
+            need = not self.probe_scheduled
+            self.probe_scheduled = True
+        return need
+
+    def mark_displayed(self):
+        now = time.time_ns()
+        with self.lock:
+            self.latencies.extend((now - ts) / 1e6 for ts in self.pending)
+            self.pending = []
+            self.probe_scheduled = False
+
+    def result(self):
+        with self.lock:
+            span = (self.last - self.first) / 1e9 if self.first is not None and self.last != self.first else None
+            return {
+                "emitted": self.emitted,
+                "received": self.received,
+                "throughput_lps": round(self.received / span, 1) if span else None,
+                "ingest_p95_ms": percentile(self.ingest, 95),
+                "latency_p50_ms": percentile(self.latencies, 50),
+                "latency_p95_ms": percentile(self.latencies, 95),
+                "latency_p99_ms": percentile(self.latencies, 99),
+                "latency_max_ms": percentile(self.latencies, 100),
+            }
+
+
+def run_gui(scenario: dict, duration: float, timeout: float):
+    sys.path.insert(0, REPO_DIR)
+    import tkinter as tk
+    from tkinter import messagebox
+    import gui_launcher
+
+    state = {"error": None, "timed_out": False, "buffered": 0, "rebuild_ms": None}
+
+    def fail(title, msg=""):
+        state["error"] = f"{title}: {msg}"
+
+    # 基准中不弹对话框，并直接使用当前解释器运行 fake_main.py
+    messagebox.showerror = fail
+    messagebox.showinfo = fail
+    messagebox.showwarning = fail
+    gui_launcher.find_python = lambda comfy_dir, venv_dir="": sys.executable
+
+    try:
+        app = gui_launcher.LauncherApp()
+    except tk.TclError as e:
+        raise SystemExit(f"[ERROR] 无法创建 Tk 窗口（{e}）。请在图形环境或 Xvfb 下运行，例如: "
+                         f"xvfb-run python bench/harness.py --mode gui")
+
+    comfy_dir = make_comfy_dir()
+    stats = LineStats()
+    orig_append = app._append_log
+
+    def append_log(level, text):
+        orig_append(level, text)
+        ts = stats.record(text, displayed=False)
+        # 插入后在 UI 线程空闲时（即重绘之后）记录显示时间，同一批行共用一次探针
+        if ts is not None and stats.queue_display(ts):
+            app.after_idle(stats.mark_displayed)
+
+    app._append_log = append_log
+    app.history_path = os.path.join(comfy_dir, "launch_history.json")
+    app.var_dir.set(comfy_dir)
+    app.var_args.set(" ".join(fake_args(scenario, duration)))
+    app.var_update.set(False)
+    app.var_disabled.set("")
+
+    # 心跳回调的延迟即为 UI 线程被占用的时间
+    lateness = []
+    beat = {"expected": None}
+
+    def heartbeat():
+        now = time.perf_counter()
+        if beat["expected"] is not None:
+            lateness.append(max(0.0, (now - beat["expected"]) * 1000))
+        beat["expected"] = now + HEARTBEAT_MS / 1000.0
+        app.after(HEARTBEAT_MS, heartbeat)
+
+    deadline = {"at": None}
+
+    def finished():
+        proc = app.proc
+        threads = (app.stdout_thread, app.stderr_thread)
+        return (proc is not None and proc.poll() is not None
+                and all(t is not None and not t.is_alive() for t in threads))
+
+    def poll():
+        # 读取线程通过 Tk 的跨线程调用写日志，必须由 mainloop 驱动，这里只用 after 轮询
+        if not (state["error"] or finished() or time.perf_counter() > deadline["at"]):
+            app.after(POLL_MS, poll)
+            return
+        if app.proc is not None and app.proc.poll() is None:
+            state["timed_out"] = True
+            app.proc.kill()
+        stats.mark_displayed()
+        state["buffered"] = len(app.log_buffer)
+        t = time.perf_counter()
+        app._rebuild_log_view()
+        app.update_idletasks()
+        state["rebuild_ms"] = round((time.perf_counter() - t) * 1000, 1)
+        app.quit()
+
+    def start():
+        deadline["at"] = time.perf_counter() + duration + timeout
+        app.on_launch()
+        heartbeat()
+        poll()
+
+    try:
+        # 等淡入动画结束后再开始，避免其计入卡顿
+        app.after(500, start)
+        app.mainloop()
+    finally:
+        try:
+            app.destroy()
+        except tk.TclError:
+            pass
+        shutil.rmtree(comfy_dir, ignore_errors=True)
+
+    result = stats.result()
+    stalls = [v for v in lateness if v >= STALL_THRESHOLD_MS]
+    result.update({
+        "stall_p99_ms": percentile(lateness, 99),
+        "stall_max_ms": percentile(lateness, 100),
+        "stall_total_ms": round(sum(stalls), 1),
+        "stall_count": len(stalls),
+        "log_buffer_lines": state["buffered"],
+        "rebuild_ms": state["rebuild_ms"],
+        "peak_rss_kb": peak_rss_kb(),
+    })
+    if state["error"]:
+        result["error"] = state["error"]
+    if state["timed_out"]:
+        result["error"] = "超时，已强制结束进程"
+    return result
+
+
+def run_cli(scenario: dict, duration: float, timeout: float):
+    comfy_dir = make_comfy_dir()
+    cfg = {
+        "COMFYUI_DIR": comfy_dir,
+        "VENV_DIR": "",
+        "AUTO_ARGS": " ".join(fake_args(scenario, duration)),
+        "UPDATE_CHECK": "0",
+        "ICON_PATH": "",
+        "DISABLED_NODES": "",
+    }
+    # 不读取仓库中的 launcher_config.ini，直接注入配置与解释器
+    code = (f"import sys; sys.path.insert(0, {REPO_DIR!r}); import launch_comfyui as l; "
+            f"l.read_config = lambda p: {cfg!r}; "
+            f"l.find_python = lambda *a, **k: sys.executable; l.main()")
+    env = os.environ.copy()
+    env["PYTHONUNBUFFERED"] = "1"
+    stats = LineStats()
+    try:
+        proc = subprocess.Popen([sys.executable, "-u", "-c", code], stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, text=True, encoding="utf-8",
+                                errors="replace", bufsize=1, env=env)
+        # 只采样 launch_comfyui.py 进程本身，不含 fake_main.py
+        sampler = PeakSampler(proc.pid)
+        sampler.start()
+        killer = threading.Timer(duration + timeout, proc.kill)
+        killer.start()
+        try:
+            for line in iter(proc.stdout.readline, ""):
+                stats.record(line.rstrip("\n"))
+            proc.wait()
+        finally:
+            killer.cancel()
+            launcher_rss = sampler.stop()
+    finally:
+        shutil.rmtree(comfy_dir, ignore_errors=True)
+
+    raw = stats.result()
+    result = {"emitted": raw["emitted"], "received": raw["received"]}
+    for key, name in CLI_METRIC_NAMES.items():
+        result[name] = raw[key]
+    result["launcher_rss_kb"] = launcher_rss
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return ""
+
+
+def load_results(path: str):
+    results = []
+    if os.path.isfile(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        results.append(json.loads(line))
+                    except Exception:
+                        pass
+    return results
+
+
+def find_regressions(record: dict, previous: list):
+    # 基线取同一平台、同一 Python 版本下最近几次相同 mode/scenario/duration 结果的中位数，
+    # 单次异常结果不会直接成为基线
+    keys = ("mode", "scenario", "duration", "platform", "python")
+    same = [r for r in previous if all(r.get(k) == record[k] for k in keys)][-BASELINE_WINDOW:]
+    if not same:
+        return None, []
+    found = []
+    for key, direction, tolerance in REGRESSION_RULES:
+        old = median([r.get("metrics", {}).get(key) for r in same])
+        new = record["metrics"].get(key)
+        if not old or new is None:
+            continue
+        if key.endswith("_ms") and abs(new - old) < MIN_MS_DELTA:
+            continue
+        change = (new - old) / old
+        if (direction == "higher" and change > tolerance) or (direction == "lower" and -change > tolerance):
+            found.append(f"{key}: {old} -> {new} ({change:+.0%})")
+    return same, found
+
+
+def median(values: list):
+    values = sorted(v for v in values if isinstance(v, (int, float)))
+    if not values:
+        return None
+    return values[len(values) // 2]
+
+
+def run_child(mode: str, name: str, duration: float, timeout: float):
+    # 每个场景在独立进程中运行，避免峰值内存相互影响
+    cmd = [sys.executable, os.path.abspath(__file__), "--mode", mode, "--scenario", name,
+           "--duration", str(duration), "--timeout", str(timeout), "--child"]
+    out = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, cwd=REPO_DIR)
+    if out.returncode == 0:
+        try:
+            return json.loads(out.stdout.strip().splitlines()[-1])
+        except Exception:
+            pass
+    # 子进程失败时返回错误信息，由 main 记录失败并继续运行其余场景
+    detail = out.stderr.strip() or out.stdout.strip()
+    return {"error": f"子进程退出码 {out.returncode}" + (f"\n{detail}" if detail else "")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ComfyUI 启动器日志管线基准")
+    parser.add_argument("--mode", choices=["gui", "cli", "all"], default="all")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS) + ["all"], default="all")
+    parser.add_argument("--duration", type=float, default=5.0, help="每个场景的日志输出秒数")
+    parser.add_argument("--timeout", type=float, default=60.0, help="输出结束后等待排空的最长秒数")
+    parser.add_argument("--results", default=RESULTS_PATH, help="结果文件（JSON Lines）")
+    parser.add_argument("--save", action="store_true", help="将本次结果追加到结果文件")
+    parser.add_argument("--check", action="store_true", help="发现回归时以退出码 1 结束")
+    parser.add_argument("--accept", action="store_true",
+                        help="即使存在回归或丢行也保存结果（例如确认性能变化符合预期后更新基线）")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        runner = run_gui if args.mode == "gui" else run_cli
+        print(json.dumps(runner(SCENARIOS[args.scenario], args.duration, args.timeout)))
+        return
+
+    modes = ["gui", "cli"] if args.mode == "all" else [args.mode]
+    names = sorted(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    previous = load_results(args.results)
+    records = []
+    regressed = False
+    failed = False
+    for mode in modes:
+        for name in names:
+            print(f"[INFO] 运行 {mode}/{name} …", flush=True)
+            metrics = run_child(mode, name, args.duration, args.timeout)
+            record = {
+                "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "mode": mode,
+                "scenario": name,
+                "duration": args.duration,
+                "params": SCENARIOS[name],
+                "metrics": metrics,
+            }
+            for key, value in metrics.items():
+                if key == "error":
+                    continue
+                print(f"         {key:<28} {value}")
+            # 没有收到任何行或结束标记说明管线本身出错，结果无效
+            if metrics.get("error") or metrics.get("emitted") is None or not metrics.get("received"):
+                print(f"[ERROR] {mode}/{name} 运行失败: {metrics.get('error') or '未收到完整输出'}")
+                failed = True
+                continue
+            bad = False
+            if metrics["received"] < metrics["emitted"]:
+                print(f"[WARN] 丢失日志行: {metrics['emitted'] - metrics['received']}")
+                bad = True
+            base, found = find_regressions(record, previous)
+            if base is None:
+                print("[INFO] 无可比较的历史结果")
+            for item in found:
+                print(f"[WARN] 性能回归（对比最近 {len(base)} 次结果的中位数）: {item}")
+            bad = bad or bool(found)
+            regressed = regressed or bad
+            # 回归或丢行的结果默认不保存，避免其成为下一次比较的基线
+            if bad and not args.accept:
+                print(f"[WARN] {mode}/{name} 的结果未保存（如确认无误请使用 --accept）")
+            else:
+                records.append(record)
+
+    if args.save and records:
+        with open(args.results, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"[INFO] 结果已保存: {args.results}")
+    if failed or (args.check and regressed):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 import os
+import re
 import sys
+import json
+import time
 import subprocess
 import threading
 import signal
@@ -13,8 +16,17 @@ DEFAULT_CFG = {
     "AUTO_ARGS": "--auto-launch",
     "UPDATE_CHECK": "1",
     "ICON_PATH": "",
+    "DISABLED_NODES": "",
 }
 
+# ComfyUI 启动时输出的自定义节点导入耗时表
+IMPORT_TIMES_HEADER = "Import times for custom nodes:"
+RE_IMPORT_TIME = re.compile(r"^\s*(\d+(?:\.\d+)?) seconds( \(IMPORT FAILED\))?: (.+?)\s*$")
+RE_IMPORT_FAIL = re.compile(r"Cannot import (.+?) module for custom nodes")
+STARTUP_DONE_MARK = "To see the GUI go to:"
+HISTORY_FILE = "launch_history.json"
+HISTORY_LIMIT = 50
+
 
 def read_config(cfg_path: str):
     cfg = DEFAULT_CFG.copy()
@@ -35,7 +47,7 @@ def read_config(cfg_path: str):
 
 def write_config(cfg_path: str, cfg: dict):
     lines = ["# ComfyUI Launcher Config"]
-    for k in ["COMFYUI_DIR", "VENV_DIR", "AUTO_ARGS", "UPDATE_CHECK", "ICON_PATH"]:
+    for k in ["COMFYUI_DIR", "VENV_DIR", "AUTO_ARGS", "UPDATE_CHECK", "ICON_PATH", "DISABLED_NODES"]:
         lines.append(f"{k}={cfg.get(k, DEFAULT_CFG.get(k, ''))}")
     with open(cfg_path, "w", encoding="utf-8") as f:
         f.write("\n".join(lines) + "\n")
@@ -100,6 +112,163 @@ def scan_venvs(comfy_dir: str):
     return found
 
 
+def parse_disabled_nodes(value: str):
+    return [n.strip() for n in (value or "").split(",") if n.strip()]
+
+
+def node_name_from_path(path: str):
+    # 日志中的路径可能来自 Windows，统一按 / 和 \ 切分
+    return re.split(r"[\\/]", path.strip().rstrip("\\/"))[-1]
+
+
+def list_custom_nodes(comfy_dir: str):
+    nodes_dir = os.path.join(comfy_dir, "custom_nodes")
+    found = []
+    try:
+        for name in sorted(os.listdir(nodes_dir)):
+            if name.startswith((".", "__")) or name.endswith(".disabled"):
+                continue
+            if os.path.isdir(os.path.join(nodes_dir, name)) or name.endswith(".py"):
+                found.append(name)
+    except Exception:
+        pass
+    return found
+
+
+def build_node_args(comfy_dir: str, disabled: list):
+    # 通过 ComfyUI 的白名单参数跳过节点，不改动 custom_nodes 目录。
+    # 白名单只列出 <COMFYUI_DIR>/custom_nodes，extra_model_paths.yaml 中的额外路径会被一并禁用
+    if not disabled:
+        return []
+    keep = [n for n in list_custom_nodes(comfy_dir) if n not in disabled]
+    args = ["--disable-all-custom-nodes"]
+    if keep:
+        args += ["--whitelist-custom-nodes"] + keep
+    return args
+
+
+class ImportTimeParser:
+    """解析 ComfyUI 启动日志中的自定义节点导入耗时表与导入失败信息。
+
+    每个输出流使用独立的实例，避免另一流中穿插的行截断耗时表。
+    """
+
+    def __init__(self):
+        self.times = {}
+        self.failed = set()
+        self.in_table = False
+        self.startup_done = False
+
+    def feed(self, line: str):
+        # 返回 "table"（耗时表结束）、"startup"（启动完成）或 None
+        if self.in_table:
+            m = RE_IMPORT_TIME.match(line)
+            if m:
+                name = node_name_from_path(m.group(3))
+                self.times[name] = float(m.group(1))
+                if m.group(2):
+                    self.failed.add(name)
+                return None
+            # 耗时表以空行结束，期间其他线程打印的行不影响解析
+            if not line.strip():
+                self.in_table = False
+                return "table"
+        if line.strip() == IMPORT_TIMES_HEADER:
+            self.in_table = True
+            self.times.clear()
+            return None
+        m = RE_IMPORT_FAIL.search(line)
+        if m:
+            self.failed.add(node_name_from_path(m.group(1)))
+            return None
+        if not self.startup_done and STARTUP_DONE_MARK in line:
+            self.startup_done = True
+            return "startup"
+        return None
+
+
+def _is_number(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _valid_history_record(rec):
+    if not isinstance(rec, dict) or not isinstance(rec.get("comfy_dir", ""), str):
+        return False
+    if not isinstance(rec.get("nodes", {}), dict) or not all(_is_number(v) for v in rec.get("nodes", {}).values()):
+        return False
+    if not all(_is_number(rec.get(k, 0)) for k in ("startup_seconds", "import_seconds", "saved_estimate")):
+        return False
+    return all(isinstance(rec.get(k, []), list) for k in ("failed", "disabled"))
+
+
+def load_launch_history(path: str):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            # 丢弃格式不正确的记录，避免统计时出错
+            return [rec for rec in data if _valid_history_record(rec)]
+    except Exception:
+        pass
+    return []
+
+
+def save_launch_history(path: str, history: list):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(history[-HISTORY_LIMIT:], f, ensure_ascii=False, indent=2)
+
+
+def _same_dir(a: str, b: str):
+    return os.path.normcase(os.path.abspath(a or "")) == os.path.normcase(os.path.abspath(b or ""))
+
+
+def node_time_history(history: list, comfy_dir: str):
+    # {节点名: [按时间顺序的导入耗时]}，仅统计同一 ComfyUI 实例
+    stats = {}
+    for rec in history:
+        if not _same_dir(rec.get("comfy_dir"), comfy_dir):
+            continue
+        for name, secs in rec.get("nodes", {}).items():
+            stats.setdefault(name, []).append(float(secs))
+    return stats
+
+
+def estimate_savings(history: list, comfy_dir: str, disabled: list):
+    # 以每个被禁用节点最近一次记录的导入耗时估算节省时间
+    stats = node_time_history(history, comfy_dir)
+    return sum(stats[n][-1] for n in disabled if stats.get(n))
+
+
+def find_regressions(times: dict, history: list, comfy_dir: str, window: int = 5):
+    # 与最近几次的中位数比较，耗时明显变长的节点视为回归
+    stats = node_time_history(history, comfy_dir)
+    result = []
+    for name, secs in times.items():
+        prev = sorted(stats.get(name, [])[-window:])
+        if not prev:
+            continue
+        median = prev[len(prev) // 2]
+        if secs >= median * 1.5 and secs - median >= 0.5:
+            result.append((name, secs, median))
+    result.sort(key=lambda r: r[1] - r[2], reverse=True)
+    return result
+
+
+def summarize_import_times(times: dict, failed: set, history: list, comfy_dir: str, top: int = 5):
+    lines = []
+    total = sum(times.values())
+    lines.append(("INFO", f"[INFO] 自定义节点导入共 {len(times)} 个，总耗时 {total:.1f} 秒"))
+    slowest = sorted(times.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    for name, secs in slowest:
+        if secs >= 0.1:
+            lines.append(("INFO", f"[INFO]   最慢: {secs:6.1f}s  {name}"))
+    for name, secs, median in find_regressions(times, history, comfy_dir):
+        lines.append(("WARN", f"[WARN] 导入耗时回归: {name} {median:.1f}s -> {secs:.1f}s"))
+    for name in sorted(failed):
+        lines.append(("ERROR", f"[ERROR] 自定义节点导入失败: {name}"))
+    return lines
+
+
 class LauncherApp(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -124,6 +293,12 @@ class LauncherApp(tk.Tk):
         self.filter_info = tk.BooleanVar(value=True)
         self.filter_warn = tk.BooleanVar(value=True)
         self.filter_error = tk.BooleanVar(value=True)
+        # 自定义节点导入耗时与启动历史
+        self.history_path = os.path.join(self.script_dir, HISTORY_FILE)
+        self.import_parsers = []
+        self.parser_lock = threading.Lock()
+        self.launch_started = None
+        self.launch_info = {}
 
         # 图标
         icon_path = self.cfg.get("ICON_PATH", "").strip()
@@ -218,8 +393,14 @@ class LauncherApp(tk.Tk):
         self.var_update = tk.BooleanVar(value=True)
         ttk.Checkbutton(left, text="启动前检查并拉取更新", variable=self.var_update).grid(row=5, column=3, sticky="e")
 
+        ttk.Label(left, text="禁用的自定义节点（逗号分隔，仅 custom_nodes/ 目录）").grid(row=6, column=0, columnspan=3, sticky="w")
+        self.var_disabled = tk.StringVar()
+        self.entry_disabled = ttk.Entry(left, textvariable=self.var_disabled)
+        self.entry_disabled.grid(row=7, column=0, columnspan=3, sticky="ew", pady=(4, 8))
+        ttk.Button(left, text="节点耗时…", command=self.on_node_profile).grid(row=7, column=3, sticky="e")
+
         btn_frame = ttk.Frame(left)
-        btn_frame.grid(row=6, column=0, columnspan=4, sticky="ew", pady=(12, 0))
+        btn_frame.grid(row=8, column=0, columnspan=4, sticky="ew", pady=(12, 0))
         for i in range(4):
             btn_frame.columnconfigure(i, weight=1)
         ttk.Button(btn_frame, text="保存配置", command=self.on_save).grid(row=0, column=0, sticky="ew")
@@ -265,6 +446,7 @@ class LauncherApp(tk.Tk):
         self.var_dir.set(self.cfg.get("COMFYUI_DIR", DEFAULT_CFG["COMFYUI_DIR"]))
         self.var_args.set(self.cfg.get("AUTO_ARGS", DEFAULT_CFG["AUTO_ARGS"]))
         self.var_update.set(str(self.cfg.get("UPDATE_CHECK", "1")).strip() == "1")
+        self.var_disabled.set(self.cfg.get("DISABLED_NODES", ""))
         # 填充 venv 列表
         self._populate_venvs()
         venv_dir = self.cfg.get("VENV_DIR", "").strip()
@@ -330,6 +512,7 @@ class LauncherApp(tk.Tk):
             "AUTO_ARGS": self.var_args.get().strip() or DEFAULT_CFG["AUTO_ARGS"],
             "UPDATE_CHECK": "1" if self.var_update.get() else "0",
             "ICON_PATH": self.cfg.get("ICON_PATH", ""),
+            "DISABLED_NODES": ",".join(parse_disabled_nodes(self.var_disabled.get())),
         }
         write_config(self.cfg_path, cfg)
         self.cfg = cfg.copy()
@@ -345,6 +528,7 @@ class LauncherApp(tk.Tk):
         self.var_dir.set(cfg.get("COMFYUI_DIR", DEFAULT_CFG["COMFYUI_DIR"]))
         self.var_args.set(cfg.get("AUTO_ARGS", DEFAULT_CFG["AUTO_ARGS"]))
         self.var_update.set(str(cfg.get("UPDATE_CHECK", "1")).strip() == "1")
+        self.var_disabled.set(cfg.get("DISABLED_NODES", ""))
         self._populate_venvs()
         venv_dir = cfg.get("VENV_DIR", "").strip()
         self.var_venv.set(venv_dir if venv_dir else "系统 Python")
@@ -362,6 +546,7 @@ class LauncherApp(tk.Tk):
             "AUTO_ARGS": self.var_args.get().strip() or DEFAULT_CFG["AUTO_ARGS"],
             "UPDATE_CHECK": "1" if self.var_update.get() else "0",
             "ICON_PATH": self.cfg.get("ICON_PATH", ""),
+            "DISABLED_NODES": ",".join(parse_disabled_nodes(self.var_disabled.get())),
         }
         write_config(file, cfg)
         self.var_status.set("[INFO] 配置已导出")
@@ -411,7 +596,7 @@ class LauncherApp(tk.Tk):
             self.log_text.see(tk.END)
 
     def _set_busy(self, busy: bool):
-        for w in (self.entry_dir, self.combo_venv, self.entry_args):
+        for w in (self.entry_dir, self.combo_venv, self.entry_args, self.entry_disabled):
             w.configure(state="disabled" if busy else "normal")
         self.progress.configure(mode="indeterminate" if busy else "determinate")
         if busy:
@@ -425,6 +610,7 @@ class LauncherApp(tk.Tk):
         venv_dir = "" if venv_sel == "系统 Python" else venv_sel
         auto_args = self.var_args.get().strip() or "--auto-launch"
         update_check = self.var_update.get()
+        disabled = parse_disabled_nodes(self.var_disabled.get())
 
         if not os.path.isdir(comfy_dir):
             messagebox.showerror("错误", f"ComfyUI 目录不存在: {comfy_dir}")
@@ -456,7 +642,13 @@ class LauncherApp(tk.Tk):
                 if update_check:
                     git_update_if_needed(comfy_dir, log)
                 # 使用 -u 强制禁用缓冲，便于日志实时显示
-                cmd = [py, "-u", main_py] + auto_args.split()
+                cmd = [py, "-u", main_py] + auto_args.split() + build_node_args(comfy_dir, disabled)
+                if disabled:
+                    log(f"[INFO] 本次禁用 {len(disabled)} 个自定义节点: {', '.join(disabled)}")
+                with self.parser_lock:
+                    self.import_parsers = [ImportTimeParser(), ImportTimeParser()]
+                self.launch_info = {"comfy_dir": comfy_dir, "disabled": disabled}
+                self.launch_started = time.time()
                 env = os.environ.copy()
                 env["PYTHONUNBUFFERED"] = "1"
                 self.proc = subprocess.Popen(
@@ -473,8 +665,8 @@ class LauncherApp(tk.Tk):
                 self._update_status_indicator(True)
                 log(f"[INFO] 已启动: {os.path.basename(py)} {os.path.basename(main_py)}")
                 # 启动日志读取线程
-                self.stdout_thread = threading.Thread(target=self._read_stream, args=(self.proc.stdout, "INFO"), daemon=True)
-                self.stderr_thread = threading.Thread(target=self._read_stream, args=(self.proc.stderr, "ERROR"), daemon=True)
+                self.stdout_thread = threading.Thread(target=self._read_stream, args=(self.proc.stdout, "INFO", self.import_parsers[0]), daemon=True)
+                self.stderr_thread = threading.Thread(target=self._read_stream, args=(self.proc.stderr, "ERROR", self.import_parsers[1]), daemon=True)
                 self.stdout_thread.start()
                 self.stderr_thread.start()
             except Exception as e:
@@ -484,7 +676,7 @@ class LauncherApp(tk.Tk):
 
         threading.Thread(target=worker, daemon=True).start()
 
-    def _read_stream(self, stream, default_level: str):
+    def _read_stream(self, stream, default_level: str, parser=None):
         try:
             for line in iter(stream.readline, ""):
                 txt = line.rstrip("\n")
@@ -496,10 +688,159 @@ class LauncherApp(tk.Tk):
                 elif txt.startswith("[ERROR]"):
                     lvl = "ERROR"
                 self._append_log(lvl, txt)
+                if parser is None:
+                    continue
+                with self.parser_lock:
+                    event = parser.feed(txt)
+                # 统计出错时只提示，不能中断日志读取
+                try:
+                    if event == "table":
+                        self._on_import_table_done()
+                    elif event == "startup":
+                        self._on_startup_done()
+                except Exception as e:
+                    self._append_log("WARN", f"[WARN] 节点耗时统计失败: {e}")
             stream.close()
         except Exception:
             pass
 
+    def _collect_import_results(self):
+        # 合并各输出流解析到的耗时与失败节点
+        times, failed = {}, set()
+        with self.parser_lock:
+            for parser in self.import_parsers:
+                times.update(parser.times)
+                failed |= parser.failed
+        return times, failed
+
+    def _on_import_table_done(self):
+        times, failed = self._collect_import_results()
+        history = load_launch_history(self.history_path)
+        comfy_dir = self.launch_info.get("comfy_dir", "")
+        for level, text in summarize_import_times(times, failed, history, comfy_dir):
+            self._append_log(level, text)
+
+    def _on_startup_done(self):
+        if self.launch_started is None:
+            return
+        elapsed = time.time() - self.launch_started
+        times, failed = self._collect_import_results()
+        failed = sorted(failed)
+        comfy_dir = self.launch_info.get("comfy_dir", "")
+        disabled = self.launch_info.get("disabled", [])
+        history = load_launch_history(self.history_path)
+        saved = estimate_savings(history, comfy_dir, disabled)
+        prev = [r for r in history if _same_dir(r.get("comfy_dir"), comfy_dir)]
+        history.append({
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "comfy_dir": comfy_dir,
+            "startup_seconds": round(elapsed, 2),
+            "import_seconds": round(sum(times.values()), 2),
+            "nodes": times,
+            "failed": failed,
+            "disabled": disabled,
+            "saved_estimate": round(saved, 2),
+        })
+        try:
+            save_launch_history(self.history_path, history)
+        except Exception as e:
+            self._append_log("WARN", f"[WARN] 启动历史保存失败: {e}")
+        msg = f"[INFO] 启动耗时 {elapsed:.1f} 秒"
+        if prev:
+            msg += f"（上次 {prev[-1].get('startup_seconds', 0):.1f} 秒）"
+        if disabled:
+            msg += f"，禁用节点预计节省 {saved:.1f} 秒"
+        self._append_log("INFO", msg)
+
+    def on_node_profile(self):
+        comfy_dir = self.var_dir.get().strip()
+        history = load_launch_history(self.history_path)
+        stats = node_time_history(history, comfy_dir)
+        records = [r for r in history if _same_dir(r.get("comfy_dir"), comfy_dir)]
+        last = records[-1] if records else {}
+        regressions = {r[0] for r in find_regressions(last.get("nodes", {}), records[:-1], comfy_dir)}
+
+        win = tk.Toplevel(self)
+        win.title("自定义节点导入耗时")
+        win.geometry("760x520")
+        win.columnconfigure(0, weight=1)
+        win.rowconfigure(1, weight=2)
+        win.rowconfigure(3, weight=1)
+
+        hint = ("双击节点切换禁用（下次启动即生效；保存配置后才会写入配置文件）。\n"
+                "注意：禁用任一节点时，extra_model_paths.yaml 中额外 custom_nodes 路径下的节点也不会加载。")
+        ttk.Label(win, text=hint, wraplength=740, padding=(8, 8, 8, 4)).grid(row=0, column=0, sticky="w")
+        cols = ("last", "avg", "runs", "status")
+        tree = ttk.Treeview(win, columns=cols, show="tree headings")
+        tree.heading("#0", text="节点")
+        tree.heading("last", text="最近耗时(s)")
+        tree.heading("avg", text="平均(s)")
+        tree.heading("runs", text="记录次数")
+        tree.heading("status", text="状态")
+        tree.column("#0", width=300)
+        for c in cols:
+            tree.column(c, width=100, anchor="e" if c != "status" else "w")
+        tree.grid(row=1, column=0, sticky="nsew", padx=8)
+
+        def fill_nodes():
+            tree.delete(*tree.get_children())
+            disabled = parse_disabled_nodes(self.var_disabled.get())
+            names = set(stats) | set(list_custom_nodes(comfy_dir)) | set(disabled)
+            rows = []
+            for name in names:
+                times = stats.get(name, [])
+                last_t = times[-1] if times else 0.0
+                rows.append((last_t, name, times))
+            rows.sort(key=lambda r: r[0], reverse=True)
+            for last_t, name, times in rows:
+                status = []
+                if name in disabled:
+                    status.append("已禁用")
+                if name in last.get("failed", []):
+                    status.append("导入失败")
+                if name in regressions:
+                    status.append("回归")
+                avg = sum(times) / len(times) if times else 0.0
+                tree.insert("", tk.END, iid=name, text=name,
+                            values=(f"{last_t:.1f}" if times else "-", f"{avg:.1f}" if times else "-",
+                                    len(times), " ".join(status)))
+
+        def toggle(_event=None):
+            sel = tree.focus()
+            if not sel:
+                return
+            disabled = parse_disabled_nodes(self.var_disabled.get())
+            if sel in disabled:
+                disabled.remove(sel)
+            else:
+                disabled.append(sel)
+            self.var_disabled.set(",".join(disabled))
+            fill_nodes()
+            tree.focus(sel)
+            tree.selection_set(sel)
+
+        tree.bind("<Double-1>", toggle)
+        fill_nodes()
+
+        ttk.Label(win, text="启动历史", padding=(8, 8, 8, 4)).grid(row=2, column=0, sticky="w")
+        hcols = ("startup", "imports", "disabled", "saved", "failed")
+        htree = ttk.Treeview(win, columns=hcols, show="tree headings", height=6)
+        htree.heading("#0", text="时间")
+        htree.heading("startup", text="启动耗时(s)")
+        htree.heading("imports", text="节点导入(s)")
+        htree.heading("disabled", text="禁用数")
+        htree.heading("saved", text="预计节省(s)")
+        htree.heading("failed", text="失败数")
+        htree.column("#0", width=160)
+        for c in hcols:
+            htree.column(c, width=100, anchor="e")
+        htree.grid(row=3, column=0, sticky="nsew", padx=8, pady=(0, 8))
+        for rec in reversed(records):
+            htree.insert("", tk.END, text=rec.get("time", ""),
+                         values=(f"{rec.get('startup_seconds', 0):.1f}", f"{rec.get('import_seconds', 0):.1f}",
+                                 len(rec.get("disabled", [])), f"{rec.get('saved_estimate', 0):.1f}",
+                                 len(rec.get("failed", []))))
+
     def on_stop(self):
         if not self.running or not self.proc:
             messagebox.showinfo("提示", "当前未在运行。")
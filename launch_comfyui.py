@@ -9,6 +9,7 @@ def read_config(cfg_path):
         "AUTO_ARGS": "--auto-launch",
         "UPDATE_CHECK": "1",
         "ICON_PATH": "",
+        "DISABLED_NODES": "",
     }
     if os.path.isfile(cfg_path):
         with open(cfg_path, "r", encoding="utf-8", errors="ignore") as f:
@@ -48,6 +49,26 @@ def find_python(comfy_dir, venv_dir=""):
         pass
     return None
 
+def build_node_args(comfy_dir, disabled_nodes=""):
+    # 白名单只列出 custom_nodes 目录，extra_model_paths.yaml 中的额外路径会被一并禁用
+    disabled = [n.strip() for n in disabled_nodes.split(",") if n.strip()]
+    if not disabled:
+        return []
+    keep = []
+    nodes_dir = os.path.join(comfy_dir, "custom_nodes")
+    try:
+        for name in sorted(os.listdir(nodes_dir)):
+            if name.startswith((".", "__")) or name.endswith(".disabled") or name in disabled:
+                continue
+            if os.path.isdir(os.path.join(nodes_dir, name)) or name.endswith(".py"):
+                keep.append(name)
+    except Exception:
+        pass
+    args = ["--disable-all-custom-nodes"]
+    if keep:
+        args += ["--whitelist-custom-nodes"] + keep
+    return args
+
 def git_update_if_needed(comfy_dir):
     try:
         subprocess.run(["git", "rev-parse", "--is-inside-work-tree"], cwd=comfy_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
@@ -75,6 +96,7 @@ def main():
     venv_dir = cfg.get("VENV_DIR", "")
     auto_args = cfg.get("AUTO_ARGS", "--auto-launch")
     update_check = cfg.get("UPDATE_CHECK", "1")
+    disabled_nodes = cfg.get("DISABLED_NODES", "")
 
     if not os.path.isdir(comfy_dir):
         print(f"[ERROR] ComfyUI 目录不存在: {comfy_dir}")
@@ -99,12 +121,14 @@ def main():
     if os.path.abspath(comfy_dir) not in os.path.abspath(py):
         print("[WARN] 当前使用的是系统 Python，建议改为 venv（可在 launcher_config.ini 设置 VENV_DIR）。")
     print(f"[INFO] 启动参数: {auto_args}")
+    if disabled_nodes.strip():
+        print(f"[INFO] 禁用自定义节点: {disabled_nodes}")
 
     if str(update_check).strip() == "1":
         print("[INFO] 检查更新...")
         git_update_if_needed(comfy_dir)
 
-    cmd = [py, main_py] + auto_args.split()
+    cmd = [py, main_py] + auto_args.split() + build_node_args(comfy_dir, disabled_nodes)
     try:
         proc = subprocess.Popen(cmd, cwd=comfy_dir)
         proc.wait()